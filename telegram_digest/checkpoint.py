@@ -0,0 +1,98 @@
+import os
+import re
+import json
+import tempfile
+from utils import MyLogger
+
+logger = MyLogger("bot").logger
+
+
+class Checkpoint:
+    """
+    Durable key-value store for the intermediate results of one run
+    (fetched ids, parsed messages, batches, running summaries, deliveries).
+
+    Every `set` rewrites the whole file atomically (write to a temp file, then
+    `os.replace`), so a crash at any point leaves either the previous or the new
+    state on disk, never a partial one. A rerun for the same chat and day loads
+    the file and can skip the stages that already completed. Once the run is
+    done, `discard` removes the file, so the next run starts from scratch.
+
+    `settings` are the inputs that shape the saved results (dates, batch size,
+    compression, ...). They are saved along with the state: if they differ on
+    a rerun, the checkpoint is stale and is discarded.
+    """
+
+    def __init__(self, path, settings: dict = None):
+        self.path = path
+        self.settings = settings or {}
+        self.state = self._load()
+
+    @classmethod
+    def for_run(
+        cls, checkpoint_dir, chat_name, run_date, settings: dict = None
+    ) -> "Checkpoint":
+        run_key = re.sub(r"\W+", "_", f"{chat_name}_{run_date:%Y-%m-%d}")
+        return cls(os.path.join(checkpoint_dir, f"{run_key}.json"), settings)
+
+    def _load(self) -> dict:
+        new_state = {"settings": self.settings}
+        if not os.path.exists(self.path):
+            return new_state
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Checkpoint: ignoring unreadable `{self.path}` ({e})")
+            return new_state
+        if not isinstance(state, dict) or state.get("settings") != self.settings:
+            logger.warning(
+                f"Checkpoint: ignoring `{self.path}`, saved with different settings"
+            )
+            return new_state
+        stages = [x for x in state if x != "settings"]
+        logger.info(f"Checkpoint: resuming from `{self.path}` (stages: {stages})")
+        return state
+
+    def _save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            try:
+                f = os.fdopen(fd, "w")
+            except BaseException:
+                os.close(fd)
+                raise
+            with f:
+                json.dump(self.state, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        # make the rename itself durable
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    def get(self, key, default=None):
+        return self.state.get(key, default)
+
+    def set(self, key, value):
+        self.state[key] = value
+        self._save()
+        logger.debug(f"Checkpoint: saved `{key}`")
+
+    def discard(self):
+        """
+        Forget the saved state (eg once the run completed)
+        """
+        self.state = {"settings": self.settings}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+            logger.info(f"Checkpoint: removed `{self.path}`")
@@ -30,6 +30,14 @@ class AppConfig(BaseSettings):
     render_msg_upstream: bool = True
     include_sender_name: bool = True
 
+    # Checkpoints (a rerun on the same day resumes from the last completed step)
+    checkpoint_dir: str = "checkpoints"
+
+    # Extractive pre-compression (before sending to the LLM)
+    extractive_compression: bool = False
+    extractive_max_tokens: int = 12000
+    extractive_min_replies_to_keep: int = 3
+
     # `BaseSettings` will attempt to load from environment
     # and form the .env file, if it exists (former takes precedence, t.ly/2hHDL)
     model_config = SettingsConfigDict(env_file='conf.env')
@@ -0,0 +1,172 @@
+import re
+from collections import Counter
+from typing import List, Optional
+import numpy as np
+import tiktoken
+from utils import MyLogger
+
+logger = MyLogger("bot").logger
+
+
+class ExtractiveCompressor:
+    """
+    CPU-only extractive pre-compression of a window of formatted messages.
+
+    Messages are ranked with TextRank over the (dense) cosine-similarity graph
+    of their TF-IDF vectors, then the highest ranked ones are kept until the
+    token budget is filled. The output keeps the original (chronological) order.
+
+    Ranking and the must-keep rules look at the message text only (no sender
+    name, no quoted upstream), so they are not skewed by who is talking or by
+    what they are replying to. Some messages are always kept, regardless of rank
+    or budget: those whose text contains links, numbers or dates, and those with
+    at least `min_replies_to_keep` replies.
+    """
+
+    word_pattern = re.compile(r"\w\w+")
+    must_keep_pattern = re.compile(r"<URL>|https?://|www\.|\d")
+    date_words = {
+        "january", "february", "march", "april", "june", "july", "august",
+        "september", "october", "november", "december", "monday", "tuesday",
+        "wednesday", "thursday", "friday", "saturday", "sunday", "today",
+        "tomorrow", "yesterday",
+        "jan", "feb", "apr", "jun", "jul", "aug", "sep", "sept", "oct", "nov",
+        "dec", "mon", "tue", "tues", "wed", "thu", "thur", "thurs", "fri",
+    }
+    # "may", "mar", "sat" and "sun" are also common words ("it may be"), so
+    # they only count as dates when capitalized mid-sentence ("moved to May")
+    ambiguous_date_pattern = re.compile(r"(?<=\w )(May|Mar|Sat|Sun)\b")
+
+    def __init__(
+        self,
+        max_tokens,
+        min_replies_to_keep=3,
+        damping=0.85,
+        max_iterations=50,
+        tolerance=1e-6,
+        encoding_name="cl100k_base",
+    ):
+        self.max_tokens = max_tokens
+        self.min_replies_to_keep = min_replies_to_keep
+        self.damping = damping
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+        self.encoding_name = encoding_name
+        self.compression_ratio = None
+
+    def _tokenize(self, texts: List[str]) -> List[List[str]]:
+        return [self.word_pattern.findall(txt.lower()) for txt in texts]
+
+    def _tfidf(self, words: List[List[str]]):
+        """
+        Builds the L2-normalized TF-IDF matrix in COO form (rows, cols, vals)
+        """
+        vocab = {}
+        rows, cols, counts = [], [], []
+        for i, msg_words in enumerate(words):
+            for word, count in Counter(msg_words).items():
+                rows.append(i)
+                cols.append(vocab.setdefault(word, len(vocab)))
+                counts.append(count)
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        doc_freq = np.bincount(cols, minlength=len(vocab))
+        idf = np.log((1 + len(words)) / (1 + doc_freq)) + 1
+        vals = np.asarray(counts, dtype=np.float64) * idf[cols]
+
+        norms = np.sqrt(np.bincount(rows, weights=vals**2, minlength=len(words)))
+        vals = vals / norms[rows]
+        return rows, cols, vals, len(vocab)
+
+    def rank(self, words: List[List[str]]) -> np.ndarray:
+        """
+        TextRank scores for each (tokenized) message.
+
+        The similarity matrix S = X @ X.T is never materialized: S @ v is computed
+        as X @ (X.T @ v), so each iteration is linear in the number of words.
+        """
+        n = len(words)
+        rows, cols, vals, n_words = self._tfidf(words)
+        has_words = np.bincount(rows, minlength=n) > 0
+
+        def similarity_dot(v):
+            xt_v = np.bincount(cols, weights=vals * v[rows], minlength=n_words)
+            x_xt_v = np.bincount(rows, weights=vals * xt_v[cols], minlength=n)
+            # drop the self-loops (the diagonal of S is 1 for non-empty messages)
+            return x_xt_v - v * has_words
+
+        degree = similarity_dot(np.ones(n))
+        inv_degree = np.divide(
+            1.0, degree, out=np.zeros(n), where=degree > self.tolerance
+        )
+
+        scores = np.full(n, 1.0 / n)
+        for _ in range(self.max_iterations):
+            new_scores = (1 - self.damping) / n + self.damping * similarity_dot(
+                scores * inv_degree
+            )
+            new_scores /= new_scores.sum()
+            converged = np.abs(new_scores - scores).sum() < self.tolerance
+            scores = new_scores
+            if converged:
+                break
+        return scores
+
+    def compress(
+        self,
+        messages: List[str],
+        reply_counts: Optional[List[int]] = None,
+        texts: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Returns the subset of `messages` that fits into `max_tokens`
+        (plus any must-keep message), in the original order.
+        `reply_counts[i]` is the number of replies to `messages[i]`.
+        `texts[i]` is the bare text of `messages[i]` (defaults to `messages[i]`),
+        used for ranking and for the must-keep rules.
+        """
+        if not messages:
+            self.compression_ratio = 1.0
+            return messages
+
+        encoding = tiktoken.get_encoding(self.encoding_name)
+        sizes = [len(x) for x in encoding.encode_ordinary_batch(messages)]
+        total_tokens = sum(sizes)
+
+        texts = [txt or "" for txt in texts] if texts is not None else messages
+        words = self._tokenize(texts)
+        reply_counts = reply_counts or [0] * len(messages)
+        must_keep = [
+            n_replies >= self.min_replies_to_keep
+            or bool(self.must_keep_pattern.search(txt))
+            or not self.date_words.isdisjoint(txt_words)
+            or bool(self.ambiguous_date_pattern.search(txt))
+            for txt, txt_words, n_replies in zip(texts, words, reply_counts)
+        ]
+        keep = list(must_keep)
+        budget = self.max_tokens - sum(s for s, k in zip(sizes, keep) if k)
+        if budget < 0:
+            logger.warning(
+                f"Extractive compression: must-keep messages exceed the budget "
+                f"by {-budget} tokens"
+            )
+
+        # fill the remaining budget with the most central messages
+        scores = self.rank(words)
+        for i in np.argsort(-scores, kind="stable"):
+            if budget <= 0:
+                break
+            if not keep[i] and sizes[i] <= budget:
+                keep[i] = True
+                budget -= sizes[i]
+
+        compressed = [msg for msg, k in zip(messages, keep) if k]
+        kept_tokens = sum(s for s, k in zip(sizes, keep) if k)
+        self.compression_ratio = kept_tokens / total_tokens if total_tokens else 1.0
+        logger.info(
+            f"Extractive compression: kept {len(compressed)}/{len(messages)} messages, "
+            f"{kept_tokens}/{total_tokens} tokens "
+            f"(compression ratio {self.compression_ratio:.2f})"
+        )
+        return compressed
@@ -105,20 +105,36 @@ class PoeBot:
         )
 
     def get_refine_summary(
-        self, messages: List[str], bot_name="a2", chatCode=None, max_tokens=4000
+        self,
+        messages: List[str],
+        bot_name="a2",
+        chatCode=None,
+        max_tokens=4000,
+        checkpoint=None,
     ):
         """
         Splits messages into batches, summarizes them **serially**:
         1. summarize the first
         2. ask to refine the summary with new context
+
+        If a `checkpoint` is given, the batches and the summary after each batch
+        are saved, and a rerun resumes from the first batch not yet summarized.
         """
-        batcher = TextBatcher(max_tokens=max_tokens)
-        batches = batcher.create_batches(messages)
-        flattened_batches = ["\n".join(batch) for batch in batches]
+        flattened_batches = checkpoint.get("batches") if checkpoint else None
+        if flattened_batches is None:
+            batcher = TextBatcher(max_tokens=max_tokens)
+            batches = batcher.create_batches(messages)
+            flattened_batches = ["\n".join(batch) for batch in batches]
+            if checkpoint:
+                checkpoint.set("batches", flattened_batches)
 
         # Summarization strategy: refine
-        running_summary = ""
+        summaries = checkpoint.get("batch_summaries", []) if checkpoint else []
+        running_summary = summaries[-1] if summaries else ""
         for i, batch in enumerate(flattened_batches):
+            if i < len(summaries):
+                logger.debug(f"Refine summary: batch {i} already summarized")
+                continue
             logger.debug(f"Refine summary: batch {i}")
             if i == 0:
                 # first message goes with the `prompt_template`
@@ -150,6 +166,9 @@ class PoeBot:
                 streaming=False,
                 preclear_context=True,
             )
+            if checkpoint:
+                summaries.append(running_summary)
+                checkpoint.set("batch_summaries", summaries)
 
         return running_summary
 
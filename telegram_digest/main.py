@@ -3,13 +3,73 @@ from utils import MyLogger, standardize_strings
 from config import Config
 from telegram_bot import TelegramBotBuilder, TelegramMessagesParsing, SummaryRenderer
 from llm import PoeBot
+from extractive import ExtractiveCompressor
+from checkpoint import Checkpoint
+from pydantic_models import Message
 from logging import DEBUG, INFO
 
 logger = MyLogger("bot").logger
 logger.setLevel(DEBUG)
 
+# max size of each batch sent to the llm
+BATCH_MAX_TOKENS = 4000
+
+
+async def get_messages_parser(tel_bot, checkpoint) -> TelegramMessagesParsing:
+    """
+    Pull and parse the Telegram messages, skipping whatever is already
+    in the checkpoint (parsed messages, or at least the fetched ids)
+    """
+    parsed_messages = checkpoint.get("parsed_messages")
+    if parsed_messages is not None:
+        logger.info("Checkpoint: reusing parsed messages")
+        return TelegramMessagesParsing.from_digest_messages(
+            tel_bot.core_api_client,
+            None,
+            [Message(**x) for x in parsed_messages],
+        )
+
+    # pull Telegram messages
+    await tel_bot.set_target_chat_id(Config.TARGET_CHAT_NAME)
+    fetched_ids = checkpoint.get("fetched_ids")
+    if fetched_ids is None:
+        messages = await tel_bot.get_messages_between_dates(
+            Config.START_DATE, Config.END_DATE
+        )
+        checkpoint.set("fetched_ids", [x.id for x in messages])
+    else:
+        messages = await tel_bot.get_messages_by_ids(fetched_ids)
+
+    # process messages
+    telparser = TelegramMessagesParsing(
+        tel_bot.core_api_client, tel_bot.target_chat_id, messages,
+        filter_out_autosum_messages=Config.filter_out_autosum_messages,
+    )
+    await telparser.build_digest_messages(render_upstreams=Config.render_msg_upstream)
+    checkpoint.set(
+        "parsed_messages", [x.model_dump() for x in telparser.digest_messages]
+    )
+    return telparser
+
 
 async def main():
+    # anything that changes the saved results must invalidate the checkpoint
+    # (START_DATE moves with the clock, so only its day is compared)
+    checkpoint = Checkpoint.for_run(
+        Config.checkpoint_dir,
+        Config.TARGET_CHAT_NAME,
+        Config.END_DATE,
+        settings={
+            "start_date": Config.START_DATE.date().isoformat(),
+            "filter_out_autosum_messages": Config.filter_out_autosum_messages,
+            "render_msg_upstream": Config.render_msg_upstream,
+            "extractive_compression": Config.extractive_compression,
+            "extractive_max_tokens": Config.extractive_max_tokens,
+            "extractive_min_replies_to_keep": Config.extractive_min_replies_to_keep,
+            "batch_max_tokens": BATCH_MAX_TOKENS,
+        },
+    )
+
     # Build a Telegram client
     tel_bot = (
         TelegramBotBuilder(Config.TELEGRAM_BOT_TOKEN)
@@ -21,34 +81,52 @@ async def main():
         .get_bot()
     )
 
-    # pull Telegram messages
-    await tel_bot.set_target_chat_id(Config.TARGET_CHAT_NAME)
-    messages = await tel_bot.get_messages_between_dates(
-        Config.START_DATE, Config.END_DATE
-    )
+    summary = checkpoint.get("summary")
+    if summary is None:
+        telparser = await get_messages_parser(tel_bot, checkpoint)
+        msgs_formatted = await telparser.to_list_of_formatted_messages(
+            clean_strings=True, render_upstreams=Config.render_msg_upstream
+        )
 
-    # process messages
-    telparser = TelegramMessagesParsing(
-        tel_bot.core_api_client, tel_bot.target_chat_id, messages,
-        filter_out_autosum_messages=Config.filter_out_autosum_messages,
-    )
-    msgs_formatted = await telparser.to_list_of_formatted_messages(
-        clean_strings=True, render_upstreams=Config.render_msg_upstream
-    )
+        # optional: keep only the most central messages, to save tokens
+        if Config.extractive_compression:
+            compressor = ExtractiveCompressor(
+                max_tokens=Config.extractive_max_tokens,
+                min_replies_to_keep=Config.extractive_min_replies_to_keep,
+            )
+            msgs_formatted = compressor.compress(
+                msgs_formatted,
+                reply_counts=telparser.reply_counts(),
+                texts=[x.text for x in telparser.digest_messages],
+            )
 
-    # get a summary
-    poe = PoeBot(Config.POE_PB_TOKEN)
-    summary = poe.get_refine_summary(
-        msgs_formatted, bot_name="a2", chatCode=Config.POE_CHAT_CODE, max_tokens=4000
-    )
+        # get a summary
+        poe = PoeBot(Config.POE_PB_TOKEN)
+        summary = poe.get_refine_summary(
+            msgs_formatted,
+            bot_name="a2",
+            chatCode=Config.POE_CHAT_CODE,
+            max_tokens=BATCH_MAX_TOKENS,
+            checkpoint=checkpoint,
+        )
+        checkpoint.set("summary", summary)
 
+    delivered = checkpoint.get("delivered", {})
     async with tel_bot.core_api_client:
         for chat_name in Config.OUTPUT_CHAT_NAMES:
-            logger.info("## Sending summary to telegram chat `{chat_name}`")
+            if delivered.get(chat_name):
+                logger.info(f"## Summary already sent to telegram chat `{chat_name}`")
+                continue
+            logger.info(f"## Sending summary to telegram chat `{chat_name}`")
             await tel_bot.core_api_send_message(
                 chat_id=chat_name,
                 message=SummaryRenderer.format(summary),
             )
+            delivered[chat_name] = True
+            checkpoint.set("delivered", delivered)
+
+    # all done: nothing left to resume, a new run should send a fresh digest
+    checkpoint.discard()
 
 
 if __name__ == "__main__":
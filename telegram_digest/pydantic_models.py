@@ -3,6 +3,7 @@ from typing import Optional
 import telethon
 
 class Message(BaseModel):
+    msg_id: Optional[int] = None
     sender_name: str
     media: Optional[str]
     text: Optional[str]
@@ -33,7 +34,7 @@ class Message(BaseModel):
         if message_text and len(message_text.strip()) < 1:
             message_text = None
 
-        return cls(sender_name=sender_name, media=media_type, text=message_text,
+        return cls(msg_id=message.id, sender_name=sender_name, media=media_type, text=message_text,
                    reply_to_msg_id=reply_to_msg_id, reply_to_msg=reply_to_msg
                    )
     
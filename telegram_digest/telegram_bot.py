@@ -1,4 +1,5 @@
 import re
+from collections import Counter
 from typing import List
 import pandas as pd
 from telethon import TelegramClient
@@ -147,6 +148,17 @@ class TelegramBot:
 
         return all_messages
 
+    async def get_messages_by_ids(self, ids: List[int]):
+        """
+        Fetch the given messages (eg the ones saved in a checkpoint)
+        """
+        logger.info(f"Fetching {len(ids)} messages by id...")
+        async with self.core_api_client:
+            msgs = await self.core_api_client.get_messages(
+                entity=self.target_chat_id, ids=ids
+            )
+        return [x for x in msgs if x]
+
 
 class TelegramMessagesParsing:
     """
@@ -163,7 +175,20 @@ class TelegramMessagesParsing:
 
         logger.debug(f"{len(self.messages)=}")
 
-    async def _build_digest_messages(self, render_upstreams=True):
+    @classmethod
+    def from_digest_messages(cls, client, chat_id, digest_messages: List[Message]):
+        """
+        Build a parser from already-parsed messages (eg loaded from a checkpoint),
+        so the messages are not fetched and parsed again
+        """
+        parser = cls(client, chat_id, [])
+        parser.digest_messages = digest_messages
+        return parser
+
+    async def build_digest_messages(self, render_upstreams=True):
+        """
+        Parse the raw Telegram messages into `Message` objects (`self.digest_messages`)
+        """
         logger.info("Making Message objects...")
         client = self.client
 
@@ -196,6 +221,16 @@ class TelegramMessagesParsing:
         logger.debug(f"  {len(self.digest_messages)=}")
         return self
 
+    def reply_counts(self) -> List[int]:
+        """
+        Number of replies (within the digest) to each digest message.
+        Aligned with `to_list_of_formatted_messages()`
+        """
+        counts = Counter(
+            x.reply_to_msg_id for x in self.digest_messages if x.reply_to_msg_id
+        )
+        return [counts.get(x.msg_id, 0) for x in self.digest_messages]
+
     async def from_sender_id_to_name(self, sender_id: int) -> str:
         """
         Get Sender names
@@ -243,7 +278,7 @@ class TelegramMessagesParsing:
         self, clean_strings=True, render_upstreams=True, include_sender_name=True
     ) -> List[str]:
         if self.messages and len(self.messages) > 0 and self.digest_messages is None:
-            _ = await self._build_digest_messages(render_upstreams=render_upstreams)
+            _ = await self.build_digest_messages(render_upstreams=render_upstreams)
 
         formatted_messages = [
             x.to_str(include_sender_name=include_sender_name)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the app modules use flat imports (`from utils import ...`), as in `python telegram_digest/main.py`
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "telegram_digest"))
@@ -0,0 +1,54 @@
+import os
+from datetime import date
+from checkpoint import Checkpoint
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "run.json"
+    checkpoint = Checkpoint(str(path), settings={"batch_max_tokens": 4000})
+    checkpoint.set("fetched_ids", [3, 2, 1])
+    checkpoint.set("delivered", {"me": True})
+
+    reloaded = Checkpoint(str(path), settings={"batch_max_tokens": 4000})
+    assert reloaded.get("fetched_ids") == [3, 2, 1]
+    assert reloaded.get("delivered") == {"me": True}
+    assert reloaded.get("summary") is None
+    assert os.listdir(tmp_path) == ["run.json"]  # no temp files left behind
+
+
+def test_for_run_path(tmp_path):
+    checkpoint = Checkpoint.for_run(
+        str(tmp_path / "checkpoints"), "Gemini Earn Users", date(2024, 1, 12)
+    )
+    checkpoint.set("summary", "done")
+    assert os.listdir(tmp_path / "checkpoints") == ["Gemini_Earn_Users_2024_01_12.json"]
+
+
+def test_different_settings_discard_the_state(tmp_path):
+    path = str(tmp_path / "run.json")
+    Checkpoint(path, settings={"extractive_compression": False}).set("summary", "old")
+
+    checkpoint = Checkpoint(path, settings={"extractive_compression": True})
+    assert checkpoint.get("summary") is None
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    path = tmp_path / "run.json"
+    path.write_text('{"fetched_ids": [1, 2')  # eg truncated by a crash
+
+    checkpoint = Checkpoint(str(path))
+    assert checkpoint.get("fetched_ids") is None
+
+    checkpoint.set("fetched_ids", [1, 2, 3])
+    assert Checkpoint(str(path)).get("fetched_ids") == [1, 2, 3]
+
+
+def test_discard(tmp_path):
+    path = tmp_path / "run.json"
+    checkpoint = Checkpoint(str(path))
+    checkpoint.set("summary", "done")
+
+    checkpoint.discard()
+    assert not path.exists()
+    assert checkpoint.get("summary") is None
+    assert Checkpoint(str(path)).get("summary") is None
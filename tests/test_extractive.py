@@ -0,0 +1,102 @@
+import pytest
+import extractive
+from extractive import ExtractiveCompressor
+
+
+class WordEncoding:
+    """Stand-in for a tiktoken encoding: one token per whitespace-separated word"""
+
+    def encode_ordinary_batch(self, messages):
+        return [msg.split() for msg in messages]
+
+
+@pytest.fixture(autouse=True)
+def word_encoding(monkeypatch):
+    monkeypatch.setattr(extractive.tiktoken, "get_encoding", lambda name: WordEncoding())
+
+
+def test_empty_input():
+    compressor = ExtractiveCompressor(max_tokens=10)
+    assert compressor.compress([]) == []
+    assert compressor.compression_ratio == 1.0
+
+
+def test_all_empty_messages():
+    compressor = ExtractiveCompressor(max_tokens=10)
+    assert compressor.compress(["", ""]) == ["", ""]
+    assert compressor.compression_ratio == 1.0
+
+
+def test_budget_is_respected_and_order_is_kept():
+    messages = [
+        "the court hearing went well",
+        "court hearing postponed again",
+        "lol",
+        "the hearing and the court plan",
+        "random unrelated chatter here",
+    ]
+    compressor = ExtractiveCompressor(max_tokens=10)
+    compressed = compressor.compress(messages)
+
+    kept_tokens = sum(len(x.split()) for x in compressed)
+    assert 0 < kept_tokens <= 10
+    assert compressed == [x for x in messages if x in compressed]
+    total_tokens = sum(len(x.split()) for x in messages)
+    assert compressor.compression_ratio == pytest.approx(kept_tokens / total_tokens)
+
+
+def test_central_messages_are_preferred():
+    messages = [
+        "genesis loan repayment plan",
+        "genesis loan repayment plan approved",
+        "nice weather",
+        "repayment plan for the genesis loan",
+    ]
+    compressed = ExtractiveCompressor(max_tokens=5).compress(messages)
+    assert "nice weather" not in compressed
+
+
+def test_must_keep_ignores_the_budget():
+    messages = [
+        "[Al] filing at https://example.com",
+        "[Al] we got 42 percent back",
+        "[Al] hearing is on monday",
+        "[Al] popular message",
+        "[Al] nothing to see",
+    ]
+    texts = [x[len("[Al] "):] for x in messages]
+    compressor = ExtractiveCompressor(max_tokens=1, min_replies_to_keep=3)
+    compressed = compressor.compress(messages, reply_counts=[0, 0, 0, 3, 0], texts=texts)
+    assert compressed == messages[:4]
+
+
+def test_must_keep_dates():
+    messages = [
+        "hearing moved to May",
+        "deadline is Fri",
+        "vote closes wed",
+        "the call is on Sat morning",
+        "it may be late",
+        "May I ask something",
+        "we sat down and read it",
+    ]
+    compressed = ExtractiveCompressor(max_tokens=1).compress(messages)
+    assert compressed == messages[:4]
+
+
+def test_must_keep_uses_the_text_not_the_formatted_message():
+    messages = [
+        "[Bob1] hello there friend",
+        "<Reply to `see https://x.com`> [Al] agree",
+    ]
+    texts = ["hello there friend", "agree"]
+    compressed = ExtractiveCompressor(max_tokens=1).compress(messages, texts=texts)
+    assert compressed == []
+
+
+def test_texts_can_be_none():
+    # eg media-only messages
+    messages = ["[Al] <Photo>", "[Al] ok"]
+    compressor = ExtractiveCompressor(max_tokens=2)
+    assert len(compressor.compress(messages, texts=[None, "ok"])) == 1
+    assert compressor.compression_ratio == 0.5
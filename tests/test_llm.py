@@ -0,0 +1,63 @@
+import pytest
+import llm
+from llm import PoeBot
+from checkpoint import Checkpoint
+
+
+class StubPoeBot(PoeBot):
+    """PoeBot that answers without calling Poe, and can fail on a given call"""
+
+    def __init__(self, fail_on_call=None):
+        self.calls = []
+        self.fail_on_call = fail_on_call
+
+    def send_message(self, txt, **kwargs):
+        self.calls.append(txt)
+        if len(self.calls) == self.fail_on_call:
+            raise RuntimeError("LLM error")
+        return f"summary {len(self.calls)}"
+
+
+@pytest.fixture(autouse=True)
+def word_tokens(monkeypatch):
+    monkeypatch.setattr(
+        llm.TextBatcher,
+        "num_tokens",
+        staticmethod(lambda txt, encoding_name="cl100k_base": len(txt.split())),
+    )
+
+
+def test_already_summarized_batches_are_skipped(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path / "run.json"))
+    checkpoint.set("batches", ["batch zero", "batch one", "batch two"])
+    checkpoint.set("batch_summaries", ["summary of batch zero"])
+
+    bot = StubPoeBot()
+    summary = bot.get_refine_summary([], checkpoint=checkpoint)
+
+    assert len(bot.calls) == 2
+    assert "batch one" in bot.calls[0]
+    assert "summary of batch zero" in bot.calls[0]
+    assert summary == "summary 2"
+    assert checkpoint.get("batch_summaries") == [
+        "summary of batch zero",
+        "summary 1",
+        "summary 2",
+    ]
+
+
+def test_resume_after_a_failure(tmp_path):
+    path = str(tmp_path / "run.json")
+    messages = ["one two", "three four", "five six"]
+
+    with pytest.raises(RuntimeError):
+        StubPoeBot(fail_on_call=3).get_refine_summary(
+            messages, max_tokens=2, checkpoint=Checkpoint(path)
+        )
+
+    bot = StubPoeBot()
+    summary = bot.get_refine_summary(messages, max_tokens=2, checkpoint=Checkpoint(path))
+    assert len(bot.calls) == 1
+    assert "five six" in bot.calls[0]
+    assert "summary 2" in bot.calls[0]  # refines the summary saved before the failure
+    assert summary == "summary 1"